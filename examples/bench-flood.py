@@ -1,4 +1,3 @@
-import asyncio
 import sys
 import time
 
@@ -10,7 +9,7 @@ async def main(address: str, size: int = 64, count: int = 4) -> None:
     t0 = time.time()
     print(f"PING {address}: {size} bytes, {count} packets")
     received = 0
-    async for r in ping.iter_rtt(address, count=count, interval=None):
+    async for r in ping.iter_rtt_batched(address, count=count):
         if r is not None:
             received += 1
     print(f"--- {address} ping statistics ---")
@@ -25,4 +24,9 @@ async def main(address: str, size: int = 64, count: int = 4) -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main(sys.argv[1], count=100_000))
+    try:
+        # Use faster event loop, when available
+        from uvloop import run
+    except ImportError:
+        from asyncio import run
+    run(main(sys.argv[1], count=100_000))
@@ -22,7 +22,12 @@ def _from_env(name: str) -> Optional[Sequence[str]]:
 
 
 def get_rustc_flags() -> Optional[Sequence[str]]:
-    return _from_env("BUILD_RUSTC_FLAGS")
+    flags = _from_env("BUILD_RUSTC_FLAGS")
+    if flags is None and os.environ.get("BUILD_NATIVE") == "1":
+        # Optimize for the build host's CPU.
+        # Resulting binary is not portable.
+        return ["-C", "target-cpu=native"]
+    return flags
 
 
 def get_cargo_flags() -> Optional[Sequence[str]]:
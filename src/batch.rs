@@ -0,0 +1,228 @@
+// ---------------------------------------------------------------------
+// Gufo Ping: Batched datagram processing
+// ---------------------------------------------------------------------
+// Copyright (C) 2022-25, Gufo Labs
+// ---------------------------------------------------------------------
+
+use super::{IcmpPacket, Padding};
+use socket2::{SockAddr, Socket};
+use std::mem::MaybeUninit;
+use std::net::IpAddr;
+#[cfg(target_os = "linux")]
+use std::net::Ipv4Addr;
+
+/// Maximal number of datagrams processed by single call
+pub(crate) const BATCH_SIZE: usize = 32;
+
+/// Buffers to receive up to BATCH_SIZE datagrams by single call.
+/// Uses `recvmmsg(2)` on Linux, falls back to the series
+/// of `recvfrom(2)` on other platforms.
+pub(crate) struct RecvBatch {
+    mtu: usize,
+    bufs: Vec<u8>,
+    items: [(usize, Option<IpAddr>); BATCH_SIZE],
+}
+
+impl RecvBatch {
+    /// Create buffers for datagrams up to `mtu` octets.
+    pub fn new(mtu: usize) -> Self {
+        Self {
+            mtu,
+            bufs: vec![0; mtu * BATCH_SIZE],
+            items: [(0, None); BATCH_SIZE],
+        }
+    }
+
+    /// Get n-th received datagram and its source address
+    pub fn get(&self, i: usize) -> (&[u8], Option<IpAddr>) {
+        let (size, addr) = self.items[i];
+        let offset = i * self.mtu;
+        (&self.bufs[offset..offset + size], addr)
+    }
+
+    /// Receive all pending datagrams, up to BATCH_SIZE.
+    /// Socket must be non-blocking.
+    /// Returns number of received datagrams.
+    #[cfg(target_os = "linux")]
+    pub fn recv(&mut self, io: &Socket) -> usize {
+        use std::mem::{size_of, zeroed};
+        use std::os::unix::io::AsRawFd;
+
+        let mut addrs: [libc::sockaddr_storage; BATCH_SIZE] = unsafe { zeroed() };
+        let mut iovecs: [libc::iovec; BATCH_SIZE] = unsafe { zeroed() };
+        let mut msgs: [libc::mmsghdr; BATCH_SIZE] = unsafe { zeroed() };
+        for (i, buf) in self.bufs.chunks_exact_mut(self.mtu).enumerate() {
+            iovecs[i].iov_base = buf.as_mut_ptr() as *mut libc::c_void;
+            iovecs[i].iov_len = self.mtu;
+            let hdr = &mut msgs[i].msg_hdr;
+            hdr.msg_name = &mut addrs[i] as *mut libc::sockaddr_storage as *mut libc::c_void;
+            hdr.msg_namelen = size_of::<libc::sockaddr_storage>() as libc::socklen_t;
+            hdr.msg_iov = &mut iovecs[i];
+            hdr.msg_iovlen = 1;
+        }
+        let r = unsafe {
+            libc::recvmmsg(
+                io.as_raw_fd(),
+                msgs.as_mut_ptr(),
+                BATCH_SIZE as libc::c_uint,
+                libc::MSG_DONTWAIT as _,
+                std::ptr::null_mut(),
+            )
+        };
+        // Either EAGAIN or error
+        let n = if r > 0 { r as usize } else { 0 };
+        for i in 0..n {
+            self.items[i] = (msgs[i].msg_len as usize, Self::get_ip(&addrs[i]));
+        }
+        n
+    }
+
+    /// Receive all pending datagrams, up to BATCH_SIZE.
+    /// Socket must be non-blocking.
+    /// Returns number of received datagrams.
+    #[cfg(not(target_os = "linux"))]
+    pub fn recv(&mut self, io: &Socket) -> usize {
+        let mut n = 0;
+        for (i, buf) in self.bufs.chunks_exact_mut(self.mtu).enumerate() {
+            let buf = unsafe { &mut *(buf as *mut [u8] as *mut [MaybeUninit<u8>]) };
+            match io.recv_from(buf) {
+                Ok((size, addr)) => {
+                    self.items[i] = (size, addr.as_socket().map(|x| x.ip()));
+                    n += 1;
+                }
+                Err(_) => break,
+            }
+        }
+        n
+    }
+
+    /// Convert socket address to IP address
+    #[cfg(target_os = "linux")]
+    fn get_ip(addr: &libc::sockaddr_storage) -> Option<IpAddr> {
+        match addr.ss_family as libc::c_int {
+            libc::AF_INET => {
+                let sin = unsafe {
+                    &*(addr as *const libc::sockaddr_storage as *const libc::sockaddr_in)
+                };
+                Some(IpAddr::V4(Ipv4Addr::from(u32::from_be(
+                    sin.sin_addr.s_addr,
+                ))))
+            }
+            libc::AF_INET6 => {
+                let sin6 = unsafe {
+                    &*(addr as *const libc::sockaddr_storage as *const libc::sockaddr_in6)
+                };
+                Some(IpAddr::from(sin6.sin6_addr.s6_addr))
+            }
+            _ => None,
+        }
+    }
+}
+
+/// Buffers to send up to BATCH_SIZE datagrams by single call.
+/// Uses `sendmmsg(2)` on Linux, falls back to the series
+/// of `sendto(2)` on other platforms.
+pub(crate) struct SendBatch {
+    mtu: usize,
+    bufs: Vec<u8>,
+    paddings: Vec<Padding>,
+    sizes: [usize; BATCH_SIZE],
+}
+
+impl SendBatch {
+    /// Create buffers for datagrams up to `mtu` octets.
+    pub fn new(mtu: usize) -> Self {
+        Self {
+            mtu,
+            bufs: vec![0; mtu * BATCH_SIZE],
+            paddings: (0..BATCH_SIZE).map(|_| Padding::default()).collect(),
+            sizes: [0; BATCH_SIZE],
+        }
+    }
+
+    /// Write packet to n-th buffer
+    pub fn set(&mut self, i: usize, pkt: &IcmpPacket) {
+        let offset = i * self.mtu;
+        let buf = &mut self.bufs[offset..offset + self.mtu];
+        let buf = unsafe { &mut *(buf as *mut [u8] as *mut [MaybeUninit<u8>]) };
+        self.sizes[i] = pkt.write(buf, &mut self.paddings[i]);
+    }
+
+    /// Get n-th datagram
+    fn get(&self, i: usize) -> &[u8] {
+        let offset = i * self.mtu;
+        &self.bufs[offset..offset + self.sizes[i]]
+    }
+
+    /// Send first `n` datagrams to `addr`.
+    /// Returns number of sent datagrams.
+    #[cfg(target_os = "linux")]
+    pub fn send(&self, io: &Socket, addr: &SockAddr, n: usize) -> std::io::Result<usize> {
+        use std::mem::zeroed;
+        use std::os::unix::io::AsRawFd;
+
+        let mut iovecs: [libc::iovec; BATCH_SIZE] = unsafe { zeroed() };
+        let mut msgs: [libc::mmsghdr; BATCH_SIZE] = unsafe { zeroed() };
+        for i in 0..n {
+            let buf = self.get(i);
+            iovecs[i].iov_base = buf.as_ptr() as *mut libc::c_void;
+            iovecs[i].iov_len = buf.len();
+            let hdr = &mut msgs[i].msg_hdr;
+            hdr.msg_name = addr.as_ptr() as *mut libc::c_void;
+            hdr.msg_namelen = addr.len() as libc::socklen_t;
+            hdr.msg_iov = &mut iovecs[i];
+            hdr.msg_iovlen = 1;
+        }
+        let r = unsafe { libc::sendmmsg(io.as_raw_fd(), msgs.as_mut_ptr(), n as libc::c_uint, 0) };
+        if r < 0 {
+            return Err(std::io::Error::last_os_error());
+        }
+        Ok(r as usize)
+    }
+
+    /// Send first `n` datagrams to `addr`.
+    /// Returns number of sent datagrams.
+    #[cfg(not(target_os = "linux"))]
+    pub fn send(&self, io: &Socket, addr: &SockAddr, n: usize) -> std::io::Result<usize> {
+        for i in 0..n {
+            if let Err(e) = io.send_to(self.get(i), addr) {
+                if i == 0 {
+                    return Err(e);
+                }
+                return Ok(i);
+            }
+        }
+        Ok(n)
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[cfg(target_os = "linux")]
+    #[test]
+    fn test_get_ip_v4() {
+        let mut addr: libc::sockaddr_storage = unsafe { std::mem::zeroed() };
+        let sin = unsafe { &mut *(&mut addr as *mut _ as *mut libc::sockaddr_in) };
+        sin.sin_family = libc::AF_INET as libc::sa_family_t;
+        sin.sin_addr.s_addr = u32::from_be_bytes([127, 0, 0, 1]).to_be();
+        assert_eq!(
+            RecvBatch::get_ip(&addr),
+            Some("127.0.0.1".parse::<IpAddr>().unwrap())
+        );
+    }
+
+    #[cfg(target_os = "linux")]
+    #[test]
+    fn test_get_ip_v6() {
+        let mut addr: libc::sockaddr_storage = unsafe { std::mem::zeroed() };
+        let sin6 = unsafe { &mut *(&mut addr as *mut _ as *mut libc::sockaddr_in6) };
+        sin6.sin6_family = libc::AF_INET6 as libc::sa_family_t;
+        sin6.sin6_addr.s6_addr[15] = 1;
+        assert_eq!(
+            RecvBatch::get_ip(&addr),
+            Some("::1".parse::<IpAddr>().unwrap())
+        );
+    }
+}
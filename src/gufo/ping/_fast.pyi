@@ -7,7 +7,7 @@
 # ---------------------------------------------------------------------
 
 # Python modules
-from typing import Dict, List, Optional
+from typing import List, Optional, Tuple
 
 class SocketWrapper(object):
     def __init__(self: "SocketWrapper", afi: int) -> None: ...
@@ -21,9 +21,22 @@ class SocketWrapper(object):
     def set_recv_buffer_size(self: "SocketWrapper", size: int) -> None: ...
     def set_coarse(self: "SocketWrapper", coarse: bool) -> None: ...
     def set_accelerated(self: "SocketWrapper", acc: bool) -> None: ...
+    def set_busy_poll(self: "SocketWrapper", usec: int) -> None: ...
     def get_fd(self: "SocketWrapper") -> int: ...
     def send(
         self: "SocketWrapper", addr: str, request_id: int, seq: int, size: int
-    ) -> None: ...
-    def recv(self: "SocketWrapper") -> Optional[Dict[str, int]]: ...
-    def get_expired(self: "SocketWrapper") -> Optional[List[str]]: ...
+    ) -> Tuple[int, int]: ...
+    def send_many(
+        self: "SocketWrapper",
+        addr: str,
+        request_id: int,
+        seq: int,
+        size: int,
+        count: int,
+    ) -> List[Tuple[int, int]]: ...
+    def recv(
+        self: "SocketWrapper",
+    ) -> Optional[List[Tuple[Tuple[int, int], float]]]: ...
+    def get_expired(
+        self: "SocketWrapper",
+    ) -> Optional[List[Tuple[int, int]]]: ...
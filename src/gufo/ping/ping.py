@@ -8,13 +8,29 @@
 
 # Python modules
 import asyncio
-import itertools
 import random
-from time import perf_counter
-from typing import AsyncIterable, Dict, Iterable, Optional, Tuple, Union
+from asyncio import Future
+from collections import deque
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Optional,
+    Tuple,
+    Union,
+)
 
 # Gufo Labs modules
-from .socket import IPv4, IPv6, PingSocket
+from .socket import DEFAULT_BUFFER_SIZE, IPv4, IPv6, PingSocket
+
+# Sequence numbers must not wrap within the window
+MAX_INFLIGHT = 0xFFFF
+# Maximal amount of addresses to remember the socket for
+ADDR_CACHE_SIZE = 4096
 
 
 class Ping(object):
@@ -45,14 +61,19 @@ class Ping(object):
                 This option is ignored on IPv6 socket due to
                 issue [#2](https://github.com/gufolabs/gufo_ping/issues/2)
         timeout: Default timeout in seconds.
-        send_buffer_size: Send buffer size.
+        send_buffer_size: Send buffer size, 4MB by default.
+            Limited by the OS settings.
             Use OS defaults when empty.
-        recv_buffer_size: Receive buffer size.
+        recv_buffer_size: Receive buffer size, 4MB by default.
+            Limited by the OS settings.
             Use OS defaults when empty.
         coarse: Use CLOCK_MONOTONIC_COARSE when set,
             fall back to CLOCK_MONOTONIC otherwise.
         accelerated: Enable platform-dependend accelerated
             socket processing.
+        busy_poll: Busy poll the device queue for incoming packets
+            up to `busy_poll` microseconds, trading CPU for the
+            lower and stabler RTT. Use OS defaults when empty.
 
     Note:
         Opening the Raw Socket may require super-user priveleges
@@ -83,7 +104,21 @@ class Ping(object):
         ```
     """
 
-    request_id = itertools.count(random.randint(0, 0xFFFF))
+    __slots__ = (
+        "__accelerated",
+        "__addr_sockets",
+        "__busy_poll",
+        "__coarse",
+        "__next_id",
+        "__recv_buffer_size",
+        "__send_buffer_size",
+        "__size",
+        "__sockets",
+        "__src_addr",
+        "__timeout",
+        "__tos",
+        "__ttl",
+    )
 
     def __init__(
         self: "Ping",
@@ -92,10 +127,11 @@ class Ping(object):
         ttl: Optional[int] = None,
         tos: Optional[int] = None,
         timeout: float = 1.0,
-        send_buffer_size: Optional[int] = None,
-        recv_buffer_size: Optional[int] = None,
+        send_buffer_size: Optional[int] = DEFAULT_BUFFER_SIZE,
+        recv_buffer_size: Optional[int] = DEFAULT_BUFFER_SIZE,
         coarse: bool = False,
         accelerated: bool = True,
+        busy_poll: Optional[int] = None,
     ) -> None:
         self.__size = size
         self.__src_addr = self._get_src_addr(src_addr)
@@ -106,7 +142,12 @@ class Ping(object):
         self.__recv_buffer_size = recv_buffer_size
         self.__coarse = coarse
         self.__accelerated = accelerated
+        self.__busy_poll = busy_poll
         self.__sockets: Dict[int, PingSocket] = {}
+        # address -> socket
+        self.__addr_sockets: Dict[str, PingSocket] = {}
+        # Next ICMP request id
+        self.__next_id = random.getrandbits(16)
 
     @staticmethod
     def _get_afi(address: str) -> int:
@@ -166,9 +207,13 @@ class Ping(object):
         Returns:
             Initialized socket instance
         """
-        afi = self._get_afi(address)
-        sock = self.__sockets.get(afi)
-        if not sock:
+        sock = self.__addr_sockets.get(address)
+        if sock is not None:
+            return sock
+        afi = IPv6 if ":" in address else IPv4
+        try:
+            sock = self.__sockets[afi]
+        except KeyError:
             sock = PingSocket(
                 afi=afi,
                 size=self.__size,
@@ -180,10 +225,30 @@ class Ping(object):
                 recv_buffer_size=self.__recv_buffer_size,
                 coarse=self.__coarse,
                 accelerated=self.__accelerated,
+                busy_poll=self.__busy_poll,
             )
             self.__sockets[afi] = sock
+        # Stop caching when full. Flushing would make the large
+        # fan-outs refill the cache over and over again.
+        if len(self.__addr_sockets) < ADDR_CACHE_SIZE:
+            self.__addr_sockets[address] = sock
         return sock
 
+    def close(self: "Ping") -> None:
+        """
+        Release all opened sockets.
+
+        Detach the sockets from the event loop and drop them.
+        Pending requests are resolved as losses.
+        Socket descriptors are closed when the sockets
+        are no longer referenced.
+        Sockets are reopened on the next request.
+        """
+        for sock in self.__sockets.values():
+            sock.close()
+        self.__sockets = {}
+        self.__addr_sockets = {}
+
     def __get_request_id(self: "Ping") -> Tuple[int, int]:
         """
         Get request id.
@@ -194,8 +259,9 @@ class Ping(object):
         Returns:
             Tuple of (`request_id`, `sequence`)
         """
-        request_id = next(self.request_id) & 0xFFFF
-        seq = random.randint(0, 0xFFFF)
+        request_id = self.__next_id
+        self.__next_id = (request_id + 1) & 0xFFFF
+        seq = random.getrandbits(16)
         return request_id, seq
 
     async def ping(
@@ -222,14 +288,14 @@ class Ping(object):
         request_id, seq = self.__get_request_id()
         return await sock.ping(addr, size=size, request_id=request_id, seq=seq)
 
-    async def iter_rtt(
+    def iter_rtt(
         self: "Ping",
         addr: str,
         *,
         size: Optional[int] = None,
         interval: Optional[float] = 1.0,
         count: Optional[int] = None,
-    ) -> AsyncIterable[Optional[float]]:
+    ) -> AsyncIterator[Optional[float]]:
         """
         Do the serie of ping probes.
 
@@ -250,22 +316,216 @@ class Ping(object):
             * Round-trip time in seconds (as float) if success.
             * None - if failed or timed out.
 
+        Note:
+            The socket is opened on the first iteration, so the
+            iterator may be created outside of the running loop.
+            Use `aclose()` to stop the series early.
         """
-        sock = self.__get_socket(addr)
         request_id, seq = self.__get_request_id()
-        t0 = 0.0
+        return _RttIter(
+            self.__get_socket,
+            addr,
+            size=size,
+            request_id=request_id,
+            seq=seq,
+            interval=interval,
+            count=count,
+        )
+
+    async def iter_rtt_batched(
+        self: "Ping",
+        addr: str,
+        *,
+        size: Optional[int] = None,
+        count: Optional[int] = None,
+        inflight: int = 64,
+    ) -> AsyncIterable[Optional[float]]:
+        """
+        Do the flood serie of ping probes.
+
+        Keep up to `inflight` echo requests on the wire, sending
+        the next request as soon as the oldest one is completed.
+        Results are yielded in the order of the requests.
+
+        Args:
+            addr: Address to ping.
+            size: Packets' size, including IP headers. Use PingSocket
+                intialized defaults, when empty.
+            count: Stop after `count` requests, if set. Do not stop
+                otherwise.
+            inflight: Maximal amount of requests awaiting the replies.
+
+        Returns:
+            Yields for each attempt:
+
+            * Round-trip time in seconds (as float) if success.
+            * None - if failed or timed out.
+        """
+        if inflight < 1 or inflight > MAX_INFLIGHT:
+            msg = f"inflight must be in 1..{MAX_INFLIGHT} range"
+            raise ValueError(msg)
+        submit_many = self.__get_socket(addr).submit_many
+        request_id, seq = self.__get_request_id()
+        pending: Deque[Future[Optional[float]]] = deque()
         n = 0
         while True:
-            if interval:
-                t0 = perf_counter()
-            yield await sock.ping(
-                addr, size=size, request_id=request_id, seq=seq
-            )
-            seq = (seq + 1) & 0xFFFF
-            if interval:
-                dt = perf_counter() - t0
-                if dt < interval:
-                    await asyncio.sleep(interval - dt)
-            n += 1
-            if count and n >= count:
+            # Fill the window by the single batch
+            burst = inflight - len(pending)
+            if count:
+                burst = min(burst, count - n)
+            if burst > 0:
+                pending.extend(
+                    submit_many(
+                        addr,
+                        burst,
+                        size=size,
+                        request_id=request_id,
+                        seq=seq,
+                    )
+                )
+                seq = (seq + burst) & 0xFFFF
+                n += burst
+            if not pending:
                 break
+            yield await pending.popleft()
+
+
+class _RttIter(object):
+    """
+    Asynchronous iterator for `Ping.iter_rtt`.
+
+    `__anext__` returns the request's future directly,
+    so no coroutine is created per probe
+    unless the pacing sleep is required.
+    The socket and the event loop are bound on the first
+    `__anext__` call.
+
+    Args:
+        get_socket: Callable returning PingSocket for the address.
+        addr: Address to ping.
+        size: Packets' size, including IP headers.
+        request_id: ICMP request id.
+        seq: Starting ICMP sequence number.
+        interval: Interval between requests, in seconds.
+        count: Stop after `count` requests, if set.
+    """
+
+    __slots__ = (
+        "_addr",
+        "_closed",
+        "_count",
+        "_deadline",
+        "_get_socket",
+        "_interval",
+        "_loop",
+        "_n",
+        "_request_id",
+        "_seq",
+        "_size",
+        "_submit",
+    )
+
+    def __init__(
+        self: "_RttIter",
+        get_socket: Callable[[str], PingSocket],
+        addr: str,
+        *,
+        size: Optional[int],
+        request_id: int,
+        seq: int,
+        interval: Optional[float],
+        count: Optional[int],
+    ) -> None:
+        self._get_socket = get_socket
+        self._addr = addr
+        self._size = size
+        self._request_id = request_id
+        self._seq = seq
+        self._interval = interval
+        self._count = count
+        self._n = 0
+        self._closed = False
+        # Replaced by the socket's `submit` on the first request
+        self._submit = self._bind
+        # Bound on the first `__anext__` call
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._deadline = 0.0
+
+    def __aiter__(self: "_RttIter") -> "_RttIter":
+        return self
+
+    def __anext__(self: "_RttIter") -> Awaitable[Optional[float]]:
+        if self._closed or (self._count and self._n >= self._count):
+            raise StopAsyncIteration
+        loop = self._loop
+        if loop is None:
+            # Use the loop's clock, so the sleep maps directly
+            # to the scheduler's deadline
+            self._loop = loop = asyncio.get_running_loop()
+            self._deadline = loop.time()
+        elif self._interval:
+            # Absolute deadline, prevents drift on long series
+            self._deadline += self._interval
+            delay = self._deadline - loop.time()
+            if delay > 0:
+                return self._paced(delay)
+            # Fallen behind (i.e. timeout > interval),
+            # restart the schedule instead of bursting.
+            self._deadline = loop.time()
+        return self._send()
+
+    def _bind(
+        self: "_RttIter",
+        addr: str,
+        size: Optional[int] = None,
+        request_id: int = 0,
+        seq: int = 0,
+    ) -> "Future[Optional[float]]":
+        """
+        Get the socket and send the first request.
+
+        Args:
+            addr: Address to ping.
+            size: Packet size in bytes, including IP header.
+            request_id: ICMP request id.
+            seq: ICMP sequental number.
+
+        Returns:
+            Request's future.
+        """
+        self._submit = self._get_socket(addr).submit
+        return self._submit(addr, size=size, request_id=request_id, seq=seq)
+
+    def _send(self: "_RttIter") -> "Future[Optional[float]]":
+        """
+        Send next request.
+
+        Returns:
+            Request's future.
+        """
+        fut = self._submit(
+            self._addr,
+            size=self._size,
+            request_id=self._request_id,
+            seq=self._seq,
+        )
+        self._seq = (self._seq + 1) & 0xFFFF
+        self._n += 1
+        return fut
+
+    async def _paced(self: "_RttIter", delay: float) -> Optional[float]:
+        """
+        Wait for the deadline, then send next request.
+
+        Args:
+            delay: Time to wait, in seconds.
+
+        Returns:
+            Request's result.
+        """
+        await asyncio.sleep(delay)
+        return await self._send()
+
+    async def aclose(self: "_RttIter") -> None:
+        """Stop the series, following requests are not sent."""
+        self._closed = True
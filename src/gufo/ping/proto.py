@@ -7,7 +7,10 @@
 """SocketWrapper protocol definition."""
 
 # Python modules
-from typing import Dict, List, Optional, Protocol
+from typing import List, Optional, Protocol, Tuple
+
+# Session id: (<address as int>, <request id> << 16 | <seq>)
+SessionId = Tuple[int, int]
 
 
 class SocketProto(Protocol):
@@ -119,6 +122,19 @@ class SocketProto(Protocol):
                 * False - disable the acceleration.
         """
 
+    def set_busy_poll(self: "SocketProto", usec: int) -> None:
+        """
+        Enable NAPI busy polling on the socket.
+
+        Sets `SO_BUSY_POLL` and `SO_PREFER_BUSY_POLL` on Linux.
+        Ignored on other platforms.
+
+        Args:
+            usec: Busy polling timeout, in microseconds.
+                Disable busy polling when set to 0.
+        """
+        ...
+
     def get_fd(
         self: "SocketProto",
     ) -> int:  # @todo: Shold be FileDescriptorLike
@@ -132,7 +148,7 @@ class SocketProto(Protocol):
 
     def send(
         self: "SocketProto", addr: str, request_id: int, seq: int, size: int
-    ) -> None:
+    ) -> SessionId:
         """
         Generate and send icmp request packet.
 
@@ -141,30 +157,62 @@ class SocketProto(Protocol):
             request_id: ICMP request id.
             seq: ICMP sequental number.
             size: Outgoing packet's size in bytes, including IP header.
+
+        Returns:
+            Session id.
+        """
+        ...
+
+    def send_many(
+        self: "SocketProto",
+        addr: str,
+        request_id: int,
+        seq: int,
+        size: int,
+        count: int,
+    ) -> List[SessionId]:
+        """
+        Generate and send the series of icmp request packets.
+
+        Sequental numbers are incremented for each packet,
+        starting from `seq`.
+
+        Args:
+            addr: Destination address.
+            request_id: ICMP request id.
+            seq: ICMP sequental number of the first packet.
+            size: Outgoing packet's size in bytes, including IP header.
+            count: Number of packets to send.
+
+        Returns:
+            List of session ids for the sent packets.
+            May be shorter than `count` if the sending failed
+            in the middle of the series.
+
+        Raises:
+            OSError: if no packets were sent.
         """
         ...
 
-    def recv(self: "SocketProto") -> Optional[Dict[str, float]]:
+    def recv(self: "SocketProto") -> Optional[List[Tuple[SessionId, float]]]:
         """
         Receive all awaiting packets.
 
         Returns:
             * `None` - when no packets received.
-            * Dict of `session id` -> `rtt`,
-                where `session id` is the string of
-                <address>-<request_id>-<seq>,
-                and `rtt` - is the measured round-trip-time in nanoseconds.
+            * List of (`session id`, `rtt`) pairs,
+                where `session id` is the one, returned by `send`,
+                and `rtt` - is the measured round-trip-time in seconds.
         """
         ...
 
-    def get_expired(self: "SocketProto") -> Optional[List[str]]:
+    def get_expired(self: "SocketProto") -> Optional[List[SessionId]]:
         """
         Get list of sessions with expired timeouts.
 
         Returns:
             * `None` - when no sessions expired.
-            * List of expired sessionn ids, where each session id
-                has the format: <address>-<request_id>-<seq>
+            * List of expired session ids, as returned by `send`.
         """
         ...
 
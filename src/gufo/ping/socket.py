@@ -13,18 +13,23 @@ Attributes:
 """
 
 # Python modules
-from asyncio import Future, get_running_loop, sleep
-from typing import Dict, Optional, cast
+import contextlib
+from asyncio import Future, TimerHandle, get_running_loop
+from typing import Dict, List, Optional, cast
 
 # Gufo Labs modules
 from ._fast import SocketWrapper
-from .proto import SocketProto
+from .proto import SessionId, SocketProto
 
 NS = 1_000_000_000.0
 IPv4 = 4
 IPv6 = 6
 MAX_TTL = 255
 MAX_TOS = 255
+MAX_BUSY_POLL = 0x7FFFFFFF
+# Default kernel buffers are too small to hold
+# replies for the floods and the large fan-outs.
+DEFAULT_BUFFER_SIZE = 4 * 1024 * 1024
 
 
 class PingSocket(object):
@@ -43,16 +48,36 @@ class PingSocket(object):
         tos: Set DSCP/TOS field to outgoing packets.
             Use OS defaults when empty.
         timeout: Default timeout in seconds.
-        send_buffer_size: Send buffer size.
+        send_buffer_size: Send buffer size, 4MB by default.
+            Limited by the OS settings.
             Use OS defaults when empty.
-        recv_buffer_size: Receive buffer size.
+        recv_buffer_size: Receive buffer size, 4MB by default.
+            Limited by the OS settings.
             Use OS defaults when empty.
         coarse: Use CLOCK_MONOTONIC_COARSE when set,
             fall back to CLOCK_MONOTONIC otherwise.
         accelerated: Enable platform-dependend accelerated
             socket processing.
+        busy_poll: Busy poll the device queue for incoming packets
+            up to `busy_poll` microseconds, trading CPU for the
+            lower and stabler RTT. Use OS defaults when empty.
     """
 
+    __slots__ = (
+        "__active",
+        "__create_future",
+        "__force_del",
+        "__loop",
+        "__reading",
+        "__sessions",
+        "__send",
+        "__size",
+        "__sock",
+        "__sock_fd",
+        "__timeout",
+        "__timeout_handler",
+    )
+
     VALID_AFI = (IPv4, IPv6)
 
     def __init__(
@@ -63,22 +88,20 @@ class PingSocket(object):
         ttl: Optional[int] = None,
         tos: Optional[int] = None,
         timeout: float = 1.0,
-        send_buffer_size: Optional[int] = None,
-        recv_buffer_size: Optional[int] = None,
+        send_buffer_size: Optional[int] = DEFAULT_BUFFER_SIZE,
+        recv_buffer_size: Optional[int] = DEFAULT_BUFFER_SIZE,
         coarse: bool = False,
         accelerated: bool = True,
+        busy_poll: Optional[int] = None,
     ) -> None:
         self.__force_del = False
         if afi not in self.VALID_AFI:
             msg = f"afi must be {IPv4} or {IPv6}"
             raise ValueError(msg)
         # Check settings
-        if ttl is not None and (ttl < 1 or ttl > MAX_TTL):
-            msg = f"ttl must be in 0..{MAX_TTL} range"
-            raise ValueError(msg)
-        if tos is not None and (tos < 0 or tos > MAX_TOS):
-            msg = f"tos must be in 0..{MAX_TOS} range"
-            raise ValueError(msg)
+        self._check_range("ttl", ttl, 1, MAX_TTL)
+        self._check_range("tos", tos, 0, MAX_TOS)
+        self._check_range("busy_poll", busy_poll, 0, MAX_BUSY_POLL)
         self.__size = size
         # Create and initialize wrapped socket
         self.__sock: SocketProto = cast(SocketProto, SocketWrapper(afi))
@@ -103,34 +126,79 @@ class PingSocket(object):
             self.__sock.set_coarse(True)
         if accelerated:
             self.__sock.set_accelerated(True)
+        if busy_poll is not None:
+            self.__sock.set_busy_poll(busy_poll)
         self.__timeout = timeout
         self.__sock_fd = self.__sock.get_fd()
-        #  <addr>-<request id>-<seq> -> future
-        self.__sessions: Dict[str, Future[Optional[float]]] = {}
-        # Install response reader
+        # session id -> future
+        self.__sessions: Dict[SessionId, Future[Optional[float]]] = {}
+        # Deadline checker, armed only while sessions are pending
+        self.__timeout_handler: Optional[TimerHandle] = None
+        # Bound to the loop, cache it for the hot path
+        self.__loop = get_running_loop()
+        # Pre-bound methods for `submit`
+        self.__create_future = self.__loop.create_future
+        self.__send = self.__sock.send
+        # Response reader is installed only while sessions are pending
+        self.__reading = False
+        # Set when requests are sent, cleared by the expiration timer
+        self.__active = False
         self.__force_del = True
-        get_running_loop().add_reader(self.__sock_fd, self._on_read)
-        # Install deadline cleaner
-        self.__cleanup_task = get_running_loop().create_task(self._cleanup())
 
     def __del__(self: "PingSocket") -> None:
+        """Perform cleanup on delete."""
+        self.close()
+
+    def close(self: "PingSocket") -> None:
         """
-        Perform cleanup on delete.
+        Release event loop resources.
 
-        * Cancel expiration task.
         * Remove socket reader.
+        * Cancel expiration timer.
+        * Resolve pending requests as losses.
+
+        The socket descriptor itself is closed
+        when the instance is garbage collected.
+        Safe to call several times.
         """
         if not self.__force_del:
             return
-        try:
+        if self.__reading:
+            self.__reading = False
             # Unsubscribe reader
-            # get_running_loop() may raise Runtime Error
-            get_running_loop().remove_reader(self.__sock_fd)
-            # Stop cleanup task
-            if self.__cleanup_task is not None:
-                self.__cleanup_task.cancel()
-        except RuntimeError:  # pragma: no cover
-            pass  # Loop is already closed
+            # Closed loop may raise Runtime Error
+            with contextlib.suppress(RuntimeError):  # pragma: no cover
+                self.__loop.remove_reader(self.__sock_fd)
+        # Stop expiration timer
+        if self.__timeout_handler is not None:
+            self.__timeout_handler.cancel()
+            self.__timeout_handler = None
+        # No replies will be read anymore
+        sessions = self.__sessions
+        self.__sessions = {}
+        for fut in sessions.values():
+            if not fut.done():
+                fut.set_result(None)
+
+    @staticmethod
+    def _check_range(
+        name: str, value: Optional[int], min_value: int, max_value: int
+    ) -> None:
+        """
+        Check optional setting is within range.
+
+        Args:
+            name: Setting name.
+            value: Setting value. Not checked when None.
+            min_value: Minimal allowed value.
+            max_value: Maximal allowed value.
+
+        Raises:
+            ValueError: if value is out of range.
+        """
+        if value is not None and (value < min_value or value > max_value):
+            msg = f"{name} must be in {min_value}..{max_value} range"
+            raise ValueError(msg)
 
     def clean_ip(self: "PingSocket", addr: str) -> str:
         """
@@ -160,23 +228,101 @@ class PingSocket(object):
             request_id: ICMP request id.
             seq: ICMP sequental number.
         """
-        if ":" in addr:
-            # Convert IPv6 address to compact form
-            addr = self.__sock.clean_ip(addr)
-        sid = f"{addr}-{request_id}-{seq}"
-        fut: Future[Optional[float]] = get_running_loop().create_future()
+        return await self.submit(
+            addr, size=size, request_id=request_id, seq=seq
+        )
+
+    def submit(
+        self: "PingSocket",
+        addr: str,
+        size: Optional[int] = None,
+        request_id: int = 0,
+        seq: int = 0,
+    ) -> "Future[Optional[float]]":
+        """
+        Send ICMP echo request without awaiting for result.
+
+        Allows to keep several requests in flight.
+
+        Args:
+            addr: Socket to ping.
+            size: Packet size in bytes, including IP header.
+            request_id: ICMP request id.
+            seq: ICMP sequental number.
+
+        Returns:
+            Future, resolved with:
+
+            * Round-trip time in seconds (as float) if success.
+            * None - if failed or timed out.
+        """
+        fut: Future[Optional[float]] = self.__create_future()
         # Build and send the packet
         try:
-            self.__sock.send(addr, request_id, seq, size or self.__size)
+            sid = self.__send(addr, request_id, seq, size or self.__size)
         except OSError:
             # Some kernels raise OSError (Network Unreachable)
             # when cannot find the route. Treat them as losses.
             fut.set_result(None)
-            return await fut
+            return fut
         # Install future in the sessions
         self.__sessions[sid] = fut
-        # Await response or timeout
-        return await fut
+        self.__active = True
+        if self.__timeout_handler is None:
+            self._arm_timeouts()
+        return fut
+
+    def submit_many(
+        self: "PingSocket",
+        addr: str,
+        count: int,
+        size: Optional[int] = None,
+        request_id: int = 0,
+        seq: int = 0,
+    ) -> "List[Future[Optional[float]]]":
+        """
+        Send the series of ICMP echo requests without awaiting for results.
+
+        Sends all requests by the single call to the Rust side.
+        Sequental numbers are incremented for each request,
+        starting from `seq`.
+
+        Args:
+            addr: Socket to ping.
+            count: Number of requests.
+            size: Packet size in bytes, including IP header.
+            request_id: ICMP request id.
+            seq: ICMP sequental number of the first request.
+
+        Returns:
+            List of futures, one per request, resolved with:
+
+            * Round-trip time in seconds (as float) if success.
+            * None - if failed or timed out.
+        """
+        create_future = self.__create_future
+        try:
+            sids = self.__sock.send_many(
+                addr, request_id, seq, size or self.__size, count
+            )
+        except OSError:
+            # Treat unroutable destinations as losses
+            sids = []
+        r: List[Future[Optional[float]]] = []
+        for sid in sids:
+            fut: Future[Optional[float]] = create_future()
+            self.__sessions[sid] = fut
+            r.append(fut)
+        if sids:
+            self.__active = True
+            if self.__timeout_handler is None:
+                self._arm_timeouts()
+        # Requests failed to send are the losses
+        for _ in range(count - len(sids)):
+            fut = create_future()
+            fut.set_result(None)
+            r.append(fut)
+        return r
 
     def _on_read(self: "PingSocket") -> None:
         """Handle socket read event."""
@@ -184,27 +330,53 @@ class PingSocket(object):
         seen = self.__sock.recv()
         if seen is None:
             return
-        # seen is the dict of sid -> rtt
-        for sid, rtt in seen.items():
+        # Bind to local, the loop may be long
+        pop = self.__sessions.pop
+        # seen is the list of (sid, rtt)
+        for sid, rtt in seen:
             # Find and pop the future in single call
-            fut = self.__sessions.pop(sid, None)
-            if fut:
+            fut = pop(sid, None)
+            # Skip futures cancelled by the caller
+            if fut is not None and not fut.done():
                 # Pass rtt to the future, unblock await in `ping`
-                fut.set_result(float(rtt) / NS)
+                fut.set_result(rtt)
+
+    def _arm_timeouts(self: "PingSocket") -> None:
+        """
+        Schedule the check for expired sessions.
+
+        Install response reader when necessary.
+        """
+        if not self.__reading:
+            self.__loop.add_reader(self.__sock_fd, self._on_read)
+            self.__reading = True
+        self.__timeout_handler = self.__loop.call_later(
+            self.__timeout, self._check_timeouts
+        )
 
-    async def _cleanup(self: "PingSocket") -> None:
+    def _check_timeouts(self: "PingSocket") -> None:
         """Check for expired sessions and close them."""
-        while True:
-            # Wait for next cycle
-            await sleep(self.__timeout)
+        self.__timeout_handler = None
+        # All replies may be already received,
+        # skip Rust call then
+        if self.__sessions:
             # Get a list of exired sids
             expired = self.__sock.get_expired()
-            if not expired:
-                continue
-            # Iterate over expired sids
-            for sid in expired:
-                # Find and pop the future by single call
-                fut = self.__sessions.pop(sid, None)
-                if fut:
-                    # Pass None to indicate the timeout
-                    fut.set_result(None)
+            if expired:
+                # Intersect in C, skipping sids already resolved
+                pop = self.__sessions.pop
+                for fut in [
+                    pop(sid) for sid in self.__sessions.keys() & expired
+                ]:
+                    if not fut.done():
+                        # Pass None to indicate the timeout
+                        fut.set_result(None)
+        # Rearm while there are sessions to expire,
+        # or when requests were sent during the last period
+        if self.__sessions or self.__active:
+            self.__active = False
+            self._arm_timeouts()
+        else:
+            # Idle for the whole timeout, stop reading
+            self.__loop.remove_reader(self.__sock_fd)
+            self.__reading = False
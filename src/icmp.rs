@@ -5,9 +5,19 @@
 // ---------------------------------------------------------------------
 
 use byteorder::{BigEndian, ByteOrder};
-use internet_checksum::checksum;
 use std::convert::TryFrom;
 use std::mem::MaybeUninit;
+use std::net::IpAddr;
+
+/// Size of header, signature and timestamp
+const HEADER_SIZE: usize = 24;
+/// Padding filler, "0"
+const PADDING: u8 = 48;
+
+/// Session id, (<address>, <request id>:16 | <seq>:16).
+/// Keeps the full address, so the ids of different
+/// destinations never collide.
+pub(crate) type Sid = (u128, u32);
 
 /// ```text
 ///  0                   1                   2                   3
@@ -63,8 +73,13 @@ impl IcmpPacket {
         }
     }
 
-    pub fn get_sid(&self, addr: String) -> String {
-        format!("{}-{}-{}", addr, self.request_id, self.seq)
+    /// Get session id.
+    pub fn get_sid(&self, addr: &IpAddr) -> Sid {
+        let a = match addr {
+            IpAddr::V4(x) => u32::from(*x) as u128,
+            IpAddr::V6(x) => u128::from(*x),
+        };
+        (a, ((self.request_id as u32) << 16) | (self.seq as u32))
     }
 
     pub fn get_ts(&self) -> u64 {
@@ -82,8 +97,9 @@ impl IcmpPacket {
         &mut *(slice as *mut [MaybeUninit<u8>] as *mut [u8])
     }
 
-    /// Write packet to buffer
-    pub fn write(&self, buf: &mut [MaybeUninit<u8>]) -> usize {
+    /// Write packet to buffer.
+    /// Same `padding` must be passed along with the same `buf`
+    pub fn write(&self, buf: &mut [MaybeUninit<u8>], padding: &mut Padding) -> usize {
         //
         // Assume buffer initialized
         let buf = unsafe { Self::slice_assume_init_mut(&mut buf[..self.size]) };
@@ -97,19 +113,78 @@ impl IcmpPacket {
         BigEndian::write_u64(&mut buf[8..], self.signature);
         // Timestamp, 8 octets
         BigEndian::write_u64(&mut buf[16..], self.ts);
-        // Generate padding, Fill rest by "A"
-        if self.size > 24 {
-            buf[24..].fill(48u8);
-        }
+        // Fill rest by "0", when necessary
+        let padding_csum = padding.get_csum(buf, self.size);
         // Calculate checksum
-        // RFC-1071
-        let cs = checksum(buf);
-        buf[2] = cs[0];
-        buf[3] = cs[1];
+        // RFC-1071, the sum is linear, so only the header
+        // is to be summed for every packet.
+        let cs = fold(sum16(&buf[..HEADER_SIZE]) + padding_csum);
+        BigEndian::write_u16(&mut buf[2..], cs);
         self.size
     }
 }
 
+/// Padding of the outgoing packets.
+/// Padding is same for all packets, so it is
+/// filled once and its partial checksum is cached.
+#[derive(Default)]
+pub(crate) struct Padding {
+    filled: usize, // Buffer is filled up to `filled` octets
+    size: usize,   // Packet size for the cached `csum`
+    csum: u32,     // Partial checksum of the padding
+}
+
+impl Padding {
+    /// Fill padding of the packet of `size` octets when necessary.
+    /// Returns partial checksum of the padding.
+    fn get_csum(&mut self, buf: &mut [u8], size: usize) -> u32 {
+        if size <= HEADER_SIZE {
+            return 0;
+        }
+        if size > self.filled {
+            buf[HEADER_SIZE.max(self.filled)..size].fill(PADDING);
+            self.filled = size;
+        }
+        if size != self.size {
+            self.csum = sum16(&buf[HEADER_SIZE..size]);
+            self.size = size;
+        }
+        self.csum
+    }
+}
+
+/// Sum buffer as big-endian 16-bit words.
+/// Odd trailing octet is padded with zero.
+/// Buffer must be shorter than 128k.
+fn sum16(buf: &[u8]) -> u32 {
+    debug_assert!(buf.len() < 1 << 17);
+    // RFC-1071: one's complement sum is byte order independent,
+    // so sum words in native order and swap the result once.
+    // Avoids per-word byte swapping and lets the compiler
+    // vectorize the loop.
+    let mut chunks = buf.chunks_exact(2);
+    let mut s: u32 = chunks
+        .by_ref()
+        .map(|c| u16::from_ne_bytes([c[0], c[1]]) as u32)
+        .sum();
+    while s >> 16 != 0 {
+        s = (s & 0xFFFF) + (s >> 16);
+    }
+    let mut s = u16::from_be(s as u16) as u32;
+    if let [b] = chunks.remainder() {
+        s += (*b as u32) << 8;
+    }
+    s
+}
+
+/// Fold sum into the 16-bit one's complement checksum
+fn fold(mut s: u32) -> u16 {
+    while s >> 16 != 0 {
+        s = (s & 0xFFFF) + (s >> 16);
+    }
+    !(s as u16)
+}
+
 // Parse IcmpPacket
 impl TryFrom<&[u8]> for IcmpPacket {
     type Error = &'static str;
@@ -174,7 +249,23 @@ mod tests {
     #[test]
     fn test_icmpv4_write() {
         let mut buf: [MaybeUninit<u8>; 4096] = unsafe { MaybeUninit::uninit().assume_init() };
-        let n = ICMPV4_REQ_PKT.write(&mut buf);
+        let mut padding = Padding::default();
+        let n = ICMPV4_REQ_PKT.write(&mut buf, &mut padding);
+        let result = unsafe {
+            // slice_assume_init_ref
+            &*(&buf[..n] as *const [MaybeUninit<u8>] as *const [u8])
+        };
+        assert_eq!(result, ICMPV4_REQ);
+    }
+
+    #[test]
+    fn test_icmpv4_write_reuse_padding() {
+        let mut buf: [MaybeUninit<u8>; 4096] = unsafe { MaybeUninit::uninit().assume_init() };
+        let mut padding = Padding::default();
+        let large = IcmpPacket::new(8, 0x0102, 1, 0xdeadbeefdeadbeef, 0x01020304, 1024 - 20);
+        large.write(&mut buf, &mut padding);
+        // Shorter packet, padding is already filled
+        let n = ICMPV4_REQ_PKT.write(&mut buf, &mut padding);
         let result = unsafe {
             // slice_assume_init_ref
             &*(&buf[..n] as *const [MaybeUninit<u8>] as *const [u8])
@@ -182,6 +273,34 @@ mod tests {
         assert_eq!(result, ICMPV4_REQ);
     }
 
+    #[test]
+    fn test_sum16_odd() {
+        assert_eq!(sum16(&[1, 2, 3]), 0x0102 + 0x0300);
+    }
+
+    #[test]
+    fn test_sum16_native_order() {
+        let buf: Vec<u8> = (0..=255u8).cycle().take(1500).collect();
+        for size in 0..buf.len() {
+            // Reference implementation, 16-bit words
+            let mut chunks = buf[..size].chunks_exact(2);
+            let mut expected: u32 = chunks
+                .by_ref()
+                .map(|c| u16::from_be_bytes([c[0], c[1]]) as u32)
+                .sum();
+            if let [b] = chunks.remainder() {
+                expected += (*b as u32) << 8;
+            }
+            assert_eq!(fold(sum16(&buf[..size])), fold(expected), "size {}", size);
+        }
+    }
+
+    #[test]
+    fn test_fold() {
+        assert_eq!(fold(0x1FFFE), 0);
+        assert_eq!(fold(0), 0xFFFF);
+    }
+
     #[test]
     fn test_arr_to_icmpv4() {
         let pkt = IcmpPacket::try_from(ICMPV4_REPLY).unwrap();
@@ -190,20 +309,36 @@ mod tests {
 
     #[test]
     fn test_icmpv4_req_get_sid() {
-        let sid = ICMPV4_REQ_PKT.get_sid("127.0.0.1".into());
-        assert_eq!(sid, "127.0.0.1-258-1")
+        let sid = ICMPV4_REQ_PKT.get_sid(&"127.0.0.1".parse().unwrap());
+        assert_eq!(sid, (0x7F000001, 0x0102_0001))
     }
 
     #[test]
     fn test_icmpv4_reply_get_sid() {
-        let sid = ICMPV4_REPLY_PKT.get_sid("127.0.0.1".into());
-        assert_eq!(sid, "127.0.0.1-258-1")
+        let sid = ICMPV4_REPLY_PKT.get_sid(&"127.0.0.1".parse().unwrap());
+        assert_eq!(sid, (0x7F000001, 0x0102_0001))
+    }
+
+    #[test]
+    fn test_icmpv6_get_sid() {
+        let sid = ICMPV4_REQ_PKT.get_sid(&"::1".parse().unwrap());
+        assert_eq!(sid, (1, 0x0102_0001));
+        let sid = ICMPV4_REQ_PKT.get_sid(&"2001:db8::1".parse().unwrap());
+        assert_eq!(sid, (0x20010DB8_00000000_00000000_00000001, 0x0102_0001))
+    }
+
+    #[test]
+    fn test_icmpv6_distinct_sid() {
+        let sid1 = ICMPV4_REQ_PKT.get_sid(&"2001:db8::1:0:0:0".parse().unwrap());
+        let sid2 = ICMPV4_REQ_PKT.get_sid(&"2001:db8::1:0".parse().unwrap());
+        assert_ne!(sid1, sid2)
     }
 
     #[test]
     fn test_icmpv4_equal_sid() {
-        let sid1 = ICMPV4_REQ_PKT.get_sid("127.0.0.1".into());
-        let sid2 = ICMPV4_REPLY_PKT.get_sid("127.0.0.1".into());
+        let addr = "127.0.0.1".parse().unwrap();
+        let sid1 = ICMPV4_REQ_PKT.get_sid(&addr);
+        let sid2 = ICMPV4_REPLY_PKT.get_sid(&addr);
         assert_eq!(sid1, sid2)
     }
 }
@@ -5,10 +5,12 @@
 // ---------------------------------------------------------------------
 
 use pyo3::prelude::*;
+pub(crate) mod batch;
+pub(crate) use batch::{RecvBatch, SendBatch, BATCH_SIZE};
 pub(crate) mod session;
 pub(crate) use session::Session;
 pub(crate) mod icmp;
-pub(crate) use icmp::IcmpPacket;
+pub(crate) use icmp::{IcmpPacket, Padding, Sid};
 pub(crate) mod socket;
 pub(crate) use socket::SocketWrapper;
 
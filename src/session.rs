@@ -4,25 +4,23 @@
 // Copyright (C) 2022-23, Gufo Labs
 // ---------------------------------------------------------------------
 
+use super::Sid;
 use std::cmp::Ordering;
 
 /// Ping probe state
-/// sid is a string of <addr>-<request id>-<seq>
+/// sid is a session id, see IcmpPacket::get_sid()
 /// deeadline - is timeout deadline in nanoseconds
 /// according to Socket::get_ts()
-#[derive(PartialEq, Eq, Clone)]
+#[derive(PartialEq, Eq, Clone, Copy)]
 pub(crate) struct Session {
-    sid: String,
+    sid: Sid,
     deadline: u64,
 }
 
 impl Session {
     /// Create new session
-    pub fn new(sid: &str, deadline: u64) -> Self {
-        Session {
-            sid: sid.to_string(),
-            deadline,
-        }
+    pub fn new(sid: Sid, deadline: u64) -> Self {
+        Session { sid, deadline }
     }
 
     /// Check if session is expired
@@ -30,9 +28,9 @@ impl Session {
         self.deadline < ts
     }
 
-    /// Get owned instance of sid
-    pub fn get_sid(&self) -> String {
-        self.sid.clone()
+    /// Get sid
+    pub fn get_sid(&self) -> Sid {
+        self.sid
     }
 }
 
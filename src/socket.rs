@@ -4,7 +4,7 @@
 // Copyright (C) 2022-25, Gufo Labs
 // ---------------------------------------------------------------------
 
-use super::{IcmpPacket, Session};
+use super::{IcmpPacket, Padding, RecvBatch, SendBatch, Session, Sid, BATCH_SIZE};
 use coarsetime::Clock;
 use pyo3::{
     exceptions::{PyOSError, PyValueError},
@@ -12,15 +12,16 @@ use pyo3::{
 };
 use rand::Rng;
 use socket2::{Domain, Protocol, SockAddr, Socket, Type};
-use std::collections::{BTreeSet, HashMap};
+use std::collections::BTreeSet;
 use std::convert::TryFrom;
 use std::mem::MaybeUninit;
-use std::net::{SocketAddrV4, SocketAddrV6};
+use std::net::{IpAddr, SocketAddrV4, SocketAddrV6};
 use std::os::unix::io::AsRawFd;
 use std::time::Instant;
 
 const MAX_SIZE: usize = 4096;
 const ICMP_SIZE: usize = 8;
+const NS: f64 = 1_000_000_000.0;
 
 enum Afi {
     IPV4,
@@ -64,7 +65,10 @@ pub(crate) struct SocketWrapper {
     sessions: BTreeSet<Session>,
     start: Instant,
     coarse: bool,
-    buf: [MaybeUninit<u8>; MAX_SIZE],
+    send_buf: [MaybeUninit<u8>; MAX_SIZE],
+    rx: RecvBatch,
+    tx: SendBatch,
+    padding: Padding,
 }
 
 #[pymethods]
@@ -92,7 +96,10 @@ impl SocketWrapper {
             timeout: 1_000_000_000,
             start: Instant::now(),
             coarse: false,
-            buf: unsafe { MaybeUninit::uninit().assume_init() },
+            send_buf: unsafe { MaybeUninit::uninit().assume_init() },
+            rx: RecvBatch::new(MAX_SIZE),
+            tx: SendBatch::new(MAX_SIZE),
+            padding: Padding::default(),
         })
     }
 
@@ -173,6 +180,12 @@ impl SocketWrapper {
         Ok(())
     }
 
+    /// Enable NAPI busy polling, in microseconds
+    fn set_busy_poll(&self, usec: u32) -> PyResult<()> {
+        self.enable_busy_poll(usec)?;
+        Ok(())
+    }
+
     /// Get socket's file descriptor
     fn get_fd(&self) -> PyResult<i32> {
         Ok(self.io.as_raw_fd())
@@ -186,65 +199,105 @@ impl SocketWrapper {
         })
     }
 
-    /// Send single ICMP echo request
-    fn send(&mut self, addr: String, request_id: u16, seq: u16, size: usize) -> PyResult<()> {
-        // Parse IP address
-        let to_addr: SockAddr = match self.proto.afi {
-            Afi::IPV4 => SocketAddrV4::new(addr.parse()?, 0).into(),
-            Afi::IPV6 => SocketAddrV6::new(addr.parse()?, 0, 0, 0).into(),
-        };
-        // Get timestamp
-        let ts = self.get_ts();
-        let pkt = IcmpPacket::new(
-            self.proto.icmp_request_type,
-            request_id,
-            seq,
-            self.signature,
-            ts,
-            size - self.proto.ip_header_size,
-        );
-        let n = pkt.write(&mut self.buf);
-        let buf = unsafe { Self::slice_assume_init_ref(&self.buf[..n]) };
-        self.io
-            .send_to(buf, &to_addr)
-            .map_err(|e| PyOSError::new_err(e.to_string()))?;
-        self.sessions
-            .insert(Session::new(&pkt.get_sid(addr), ts + self.timeout));
-        Ok(())
+    /// Send single ICMP echo request.
+    /// Returns session id
+    fn send(&mut self, addr: &str, request_id: u16, seq: u16, size: usize) -> PyResult<Sid> {
+        let (ip, to_addr) = self.parse_addr(addr)?;
+        self.send_to(&ip, &to_addr, request_id, seq, size)
+            .map_err(|e| PyOSError::new_err(e.to_string()))
     }
 
-    /// Receive all pending icmp echo replies.
-    /// Returns dict of <session id> -> rtt
-    fn recv(&mut self) -> PyResult<Option<HashMap<String, u64>>> {
-        let mut r = HashMap::<String, u64>::new();
-        while let Ok((size, addr)) = self.io.recv_from(&mut self.buf) {
-            // Drop too short packets
-            if size < self.proto.ip_header_size + ICMP_SIZE {
-                continue;
+    /// Send `count` ICMP echo requests with sequental
+    /// seq numbers, starting from `seq`.
+    /// Requests are sent by batches of up to BATCH_SIZE.
+    /// Returns list of session ids of the sent requests.
+    /// Stops on first error, raises it only when nothing
+    /// has been sent.
+    fn send_many(
+        &mut self,
+        addr: &str,
+        request_id: u16,
+        seq: u16,
+        size: usize,
+        count: usize,
+    ) -> PyResult<Vec<Sid>> {
+        let (ip, to_addr) = self.parse_addr(addr)?;
+        let mut r = Vec::<Sid>::with_capacity(count);
+        let mut sids = [(0u128, 0u32); BATCH_SIZE];
+        let mut seq = seq;
+        let mut left = count;
+        while left > 0 {
+            let n = left.min(BATCH_SIZE);
+            // Same timestamp for the whole batch
+            let ts = self.get_ts();
+            for (i, sid) in sids.iter_mut().enumerate().take(n) {
+                let pkt = IcmpPacket::new(
+                    self.proto.icmp_request_type,
+                    request_id,
+                    seq,
+                    self.signature,
+                    ts,
+                    size - self.proto.ip_header_size,
+                );
+                self.tx.set(i, &pkt);
+                *sid = pkt.get_sid(&ip);
+                seq = seq.wrapping_add(1);
             }
-            let buf =
-                unsafe { Self::slice_assume_init_ref(&self.buf[self.proto.ip_header_size..size]) };
-            // Parse packet
-            if let Ok(pkt) = IcmpPacket::try_from(buf) {
-                if pkt.is_match(self.proto.icmp_reply_type, self.signature) {
-                    // Measure RTT
-                    let ts = self.get_ts();
-                    let pkt_ts = pkt.get_ts();
-                    let delay = if ts > pkt_ts {
-                        ts - pkt_ts
-                    } else {
-                        1 // Minimal delay
-                    };
-                    // Convert SockAddr to printable form
-                    let paddr = match self.proto.afi {
-                        Afi::IPV4 => addr.as_socket_ipv4().unwrap().ip().to_string(),
-                        Afi::IPV6 => addr.as_socket_ipv6().unwrap().ip().to_string(),
-                    };
-                    r.insert(pkt.get_sid(paddr.clone()), delay);
-                    self.sessions
-                        .remove(&Session::new(&pkt.get_sid(paddr), pkt_ts + self.timeout));
+            let sent = match self.tx.send(&self.io, &to_addr, n) {
+                Ok(sent) => sent,
+                Err(e) if r.is_empty() => return Err(PyOSError::new_err(e.to_string())),
+                Err(_) => 0,
+            };
+            for sid in sids[..sent].iter() {
+                self.sessions.insert(Session::new(*sid, ts + self.timeout));
+                r.push(*sid);
+            }
+            if sent < n {
+                break;
+            }
+            left -= n;
+        }
+        Ok(r)
+    }
+
+    /// Receive all pending icmp echo replies.
+    /// Returns list of (<session id>, rtt in seconds)
+    fn recv(&mut self) -> PyResult<Option<Vec<(Sid, f64)>>> {
+        let mut r = Vec::<(Sid, f64)>::new();
+        loop {
+            // Receive up to BATCH_SIZE replies by single call
+            let n = self.rx.recv(&self.io);
+            for i in 0..n {
+                let (buf, addr) = self.rx.get(i);
+                // Drop too short packets
+                if buf.len() < self.proto.ip_header_size + ICMP_SIZE {
+                    continue;
+                }
+                let Some(addr) = addr else {
+                    continue;
+                };
+                // Parse packet
+                if let Ok(pkt) = IcmpPacket::try_from(&buf[self.proto.ip_header_size..]) {
+                    if pkt.is_match(self.proto.icmp_reply_type, self.signature) {
+                        // Measure RTT
+                        let ts = self.get_ts();
+                        let pkt_ts = pkt.get_ts();
+                        let delay = if ts > pkt_ts {
+                            ts - pkt_ts
+                        } else {
+                            1 // Minimal delay
+                        };
+                        let sid = pkt.get_sid(&addr);
+                        r.push((sid, delay as f64 / NS));
+                        self.sessions
+                            .remove(&Session::new(sid, pkt_ts + self.timeout));
+                    }
                 }
             }
+            if n < BATCH_SIZE {
+                // Drained
+                break;
+            }
         }
         if !r.is_empty() {
             Ok(Some(r))
@@ -254,7 +307,7 @@ impl SocketWrapper {
     }
 
     /// Get list of session ids of expired sessions
-    fn get_expired(&mut self) -> PyResult<Option<Vec<String>>> {
+    fn get_expired(&mut self) -> PyResult<Option<Vec<Sid>>> {
         let mut r = Vec::<Session>::new();
         // @todo: Waiting until map_first_last API
         let ts = self.get_ts();
@@ -268,7 +321,7 @@ impl SocketWrapper {
             if !item.is_expired(ts) {
                 break;
             }
-            r.push(item.clone());
+            r.push(*item);
         }
         // Cleanup expired sessions sessions
         for item in r.iter() {
@@ -297,6 +350,47 @@ impl SocketWrapper {
         }
     }
 
+    /// Parse IP address according to the address family
+    fn parse_addr(&self, addr: &str) -> PyResult<(IpAddr, SockAddr)> {
+        let ip: IpAddr = match self.proto.afi {
+            Afi::IPV4 => IpAddr::V4(addr.parse()?),
+            Afi::IPV6 => IpAddr::V6(addr.parse()?),
+        };
+        let to_addr: SockAddr = match ip {
+            IpAddr::V4(x) => SocketAddrV4::new(x, 0).into(),
+            IpAddr::V6(x) => SocketAddrV6::new(x, 0, 0, 0).into(),
+        };
+        Ok((ip, to_addr))
+    }
+
+    /// Build and send ICMP echo request, register session.
+    /// Returns session id
+    fn send_to(
+        &mut self,
+        ip: &IpAddr,
+        to_addr: &SockAddr,
+        request_id: u16,
+        seq: u16,
+        size: usize,
+    ) -> std::io::Result<Sid> {
+        // Get timestamp
+        let ts = self.get_ts();
+        let pkt = IcmpPacket::new(
+            self.proto.icmp_request_type,
+            request_id,
+            seq,
+            self.signature,
+            ts,
+            size - self.proto.ip_header_size,
+        );
+        let n = pkt.write(&mut self.send_buf, &mut self.padding);
+        let buf = unsafe { Self::slice_assume_init_ref(&self.send_buf[..n]) };
+        self.io.send_to(buf, to_addr)?;
+        let sid = pkt.get_sid(ip);
+        self.sessions.insert(Session::new(sid, ts + self.timeout));
+        Ok(sid)
+    }
+
     /// Attach cBPF filter to socket to reduce context switches
     #[cfg(target_os = "linux")]
     fn enable_accelerated(&self) -> std::io::Result<()> {
@@ -355,6 +449,48 @@ impl SocketWrapper {
     fn disable_accelerated(&self) -> std::io::Result<()> {
         Ok(())
     }
+    /// Set SO_BUSY_POLL and SO_PREFER_BUSY_POLL socket options
+    #[cfg(target_os = "linux")]
+    fn enable_busy_poll(&self, usec: u32) -> std::io::Result<()> {
+        self.setsockopt_int(libc::SOL_SOCKET, libc::SO_BUSY_POLL, usec as libc::c_int)?;
+        // Prefer busy polling over the interrupts.
+        // Available since Linux 5.11, ignore errors on older kernels.
+        let _ = self.setsockopt_int(
+            libc::SOL_SOCKET,
+            libc::SO_PREFER_BUSY_POLL,
+            if usec > 0 { 1 } else { 0 },
+        );
+        Ok(())
+    }
+
+    #[cfg(not(target_os = "linux"))]
+    fn enable_busy_poll(&self, _usec: u32) -> std::io::Result<()> {
+        Ok(())
+    }
+
+    /// Set integer socket option
+    #[cfg(target_os = "linux")]
+    fn setsockopt_int(
+        &self,
+        level: libc::c_int,
+        name: libc::c_int,
+        value: libc::c_int,
+    ) -> std::io::Result<()> {
+        let r = unsafe {
+            libc::setsockopt(
+                self.io.as_raw_fd(),
+                level,
+                name,
+                &value as *const libc::c_int as *const libc::c_void,
+                std::mem::size_of::<libc::c_int>() as libc::socklen_t,
+            )
+        };
+        if r < 0 {
+            return Err(std::io::Error::last_os_error());
+        }
+        Ok(())
+    }
+
     // Assume buffer initialized
     // @todo: Replace with BufRead.filled()
     // @todo: Replace when `maybe_uninit_slice` feature
@@ -0,0 +1,20 @@
+# ---------------------------------------------------------------------
+# Gufo Ping: Test fixtures
+# ---------------------------------------------------------------------
+# Copyright (C) 2022-25, Gufo Labs
+# ---------------------------------------------------------------------
+
+# Python modules
+import asyncio
+from typing import Iterator
+
+# Third-party modules
+import pytest
+
+
+@pytest.fixture(scope="module")
+def loop() -> Iterator[asyncio.AbstractEventLoop]:
+    """Event loop, shared by the module's tests."""
+    lp = asyncio.new_event_loop()
+    yield lp
+    lp.close()
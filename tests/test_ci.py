@@ -16,6 +16,11 @@ from typing import Iterable
 import pytest
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader  # type: ignore[assignment]
+
 
 def _get_root() -> str:
     mod_path = inspect.getfile(sys.modules[__name__])
@@ -48,29 +53,28 @@ def action_label(action: Action) -> str:
 
 
 def _iter_actions() -> Iterable[Action]:
-    versions = {a.split("@")[0]: a.split("@")[1] for a in VERSIONS}
+    versions = dict(a.split("@", 1) for a in VERSIONS)
     root = os.path.join(_get_root(), ".github", "workflows")
     for fn in os.listdir(root):
         if fn.startswith(".") or not fn.endswith(".yml"):
             continue
         path = os.path.join(root, fn)
         with open(path) as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=SafeLoader)
         for job in data["jobs"]:
             for step in data["jobs"][job]["steps"]:
-                if "uses" in step:
-                    uses = step["uses"]
-                    for v in versions:
-                        if uses.startswith(f"{v}@"):
-                            yield Action(
-                                path=fn,
-                                job=job,
-                                step=step["name"],
-                                action=v,
-                                version=uses.split("@")[1],
-                                expected=versions[v],
-                            )
-                            break
+                if "uses" not in step:
+                    continue
+                action, _, version = step["uses"].partition("@")
+                if action in versions:
+                    yield Action(
+                        path=fn,
+                        job=job,
+                        step=step["name"],
+                        action=action,
+                        version=version,
+                        expected=versions[action],
+                    )
 
 
 @pytest.mark.parametrize("action", list(_iter_actions()), ids=action_label)
@@ -6,7 +6,8 @@
 
 # Python modules
 import asyncio
-from typing import Any, Dict, Iterable, List, Optional, Union
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 
 # Third-party modules
 import pytest
@@ -17,6 +18,14 @@ from gufo.ping import Ping
 from .util import as_str, caps
 
 
+@pytest.fixture(scope="module")
+def ping(loop: asyncio.AbstractEventLoop) -> Iterator[Ping]:
+    """Ping instance with default settings, bound to the module's loop."""
+    p = Ping()
+    yield p
+    p.close()
+
+
 @pytest.mark.parametrize(
     ("address", "expected"), [("127.0.0.1", 4), ("::1", 6)]
 )
@@ -34,9 +43,10 @@ def test_get_afi(address: str, expected: int) -> None:
         ("192.0.2.1", False),  # RFC-5737 test range, should fail
     ],
 )
-def test_ping(address: str, expected: bool) -> None:
-    ping = Ping()
-    rtt = asyncio.run(ping.ping(address))
+def test_ping(
+    loop: asyncio.AbstractEventLoop, ping: Ping, address: str, expected: bool
+) -> None:
+    rtt = loop.run_until_complete(ping.ping(address))
     if expected:
         assert isinstance(rtt, float)
         assert rtt > 0.0
@@ -53,7 +63,9 @@ def test_ping(address: str, expected: bool) -> None:
         ("192.0.2.1", False),  # RFC-5737 test range, should fail
     ],
 )
-def test_iter_rtt(address: str, expected: bool) -> None:
+def test_iter_rtt(
+    loop: asyncio.AbstractEventLoop, ping: Ping, address: str, expected: bool
+) -> None:
     async def inner() -> List[Optional[float]]:
         r: List[Optional[float]] = []
         async for rtt in ping.iter_rtt(address, count=N_PROBES):
@@ -61,8 +73,76 @@ def test_iter_rtt(address: str, expected: bool) -> None:
         return r
 
     N_PROBES = 5
-    ping = Ping()
-    res = asyncio.run(inner())
+    res = loop.run_until_complete(inner())
+    assert len(res) == N_PROBES
+    if expected:
+        nr = sum(1 for rtt in res if rtt is not None)
+        assert nr == N_PROBES
+    else:
+        nr = sum(1 for rtt in res if rtt is None)
+        assert nr == N_PROBES
+
+
+@pytest.mark.skipif(caps.is_denied, reason="Permission denied")
+def test_iter_rtt_aclose(loop: asyncio.AbstractEventLoop, ping: Ping) -> None:
+    async def inner() -> List[Optional[float]]:
+        r: List[Optional[float]] = []
+        async for rtt in it:
+            r.append(rtt)
+            await it.aclose()
+        return r
+
+    # Created outside of the running loop
+    it = ping.iter_rtt("127.0.0.1", interval=None)
+    res = loop.run_until_complete(inner())
+    assert len(res) == 1
+
+
+@pytest.mark.skipif(caps.is_denied, reason="Permission denied")
+@pytest.mark.parametrize("interval", [None, 0.1])
+def test_iter_rtt_interval(
+    loop: asyncio.AbstractEventLoop, ping: Ping, interval: Optional[float]
+) -> None:
+    async def inner() -> List[Optional[float]]:
+        r: List[Optional[float]] = []
+        async for rtt in ping.iter_rtt(
+            "127.0.0.1", count=N_PROBES, interval=interval
+        ):
+            r.append(rtt)
+        return r
+
+    N_PROBES = 3
+    t0 = time.perf_counter()
+    res = loop.run_until_complete(inner())
+    dt = time.perf_counter() - t0
+    assert len(res) == N_PROBES
+    # No sleep after the last probe
+    expected = (N_PROBES - 1) * (interval or 0.0)
+    assert expected <= dt < expected + 0.5
+
+
+@pytest.mark.skipif(caps.is_denied, reason="Permission denied")
+@pytest.mark.parametrize(
+    ("address", "expected"),
+    [
+        # IPv4
+        ("127.0.0.1", True),  # Loopback, always available
+        ("192.0.2.1", False),  # RFC-5737 test range, should fail
+    ],
+)
+def test_iter_rtt_batched(
+    loop: asyncio.AbstractEventLoop, ping: Ping, address: str, expected: bool
+) -> None:
+    async def inner() -> List[Optional[float]]:
+        r: List[Optional[float]] = []
+        async for rtt in ping.iter_rtt_batched(
+            address, count=N_PROBES, inflight=4
+        ):
+            r.append(rtt)
+        return r
+
+    N_PROBES = 10
+    res = loop.run_until_complete(inner())
     assert len(res) == N_PROBES
     if expected:
         nr = sum(1 for rtt in res if rtt is not None)
@@ -72,6 +152,20 @@ def test_iter_rtt(address: str, expected: bool) -> None:
         assert nr == N_PROBES
 
 
+@pytest.mark.parametrize("inflight", [-1, 0, 0x10000])
+def test_iter_rtt_batched_inflight(
+    loop: asyncio.AbstractEventLoop, ping: Ping, inflight: int
+) -> None:
+    async def inner() -> None:
+        async for _ in ping.iter_rtt_batched(
+            "127.0.0.1", count=1, inflight=inflight
+        ):
+            pass
+
+    with pytest.raises(ValueError):
+        loop.run_until_complete(inner())
+
+
 @pytest.mark.skipif(caps.is_denied, reason="Permission denied")
 @pytest.mark.parametrize("addr", caps.loopbacks)
 @pytest.mark.parametrize(
@@ -92,23 +186,36 @@ def test_iter_rtt(address: str, expected: bool) -> None:
         ({"tos": 255}, True),
         ({"tos": 256}, False),
         # send_buffer_size
+        ({"send_buffer_size": None}, True),
         ({"send_buffer_size": 1048576}, True),
         # recv_buffer_size
+        ({"recv_buffer_size": None}, True),
         ({"recv_buffer_size": 1048576}, True),
         # coarse
         ({"coarse": True}, True),
         ({"coarse": False}, True),
+        # busy_poll
+        ({"busy_poll": -1}, False),
+        ({"busy_poll": 0}, True),
+        ({"busy_poll": 50}, True),
     ],
     ids=as_str,
 )
 def test_valid_ping_settings(
-    addr: str, cfg: Dict[str, Any], expected: bool
+    loop: asyncio.AbstractEventLoop,
+    addr: str,
+    cfg: Dict[str, Any],
+    expected: bool,
 ) -> None:
-    if expected:
-        asyncio.run(Ping(**cfg).ping(addr))
-    else:
-        with pytest.raises(ValueError):
-            asyncio.run(Ping(**cfg).ping(addr))
+    ping = Ping(**cfg)
+    try:
+        if expected:
+            loop.run_until_complete(ping.ping(addr))
+        else:
+            with pytest.raises(ValueError):
+                loop.run_until_complete(ping.ping(addr))
+    finally:
+        ping.close()
 
 
 @pytest.mark.parametrize(
@@ -135,8 +242,11 @@ def test_src_addr(
 
 @pytest.mark.skipif(caps.is_denied, reason="Permission denied")
 @pytest.mark.parametrize("addr", caps.loopbacks)
-def test_src_ping(addr: str) -> None:
+def test_src_ping(loop: asyncio.AbstractEventLoop, addr: str) -> None:
     ping = Ping(src_addr=addr)
-    rtt = asyncio.run(ping.ping(addr))
+    try:
+        rtt = loop.run_until_complete(ping.ping(addr))
+    finally:
+        ping.close()
     assert isinstance(rtt, float)
     assert rtt > 0.0
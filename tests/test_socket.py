@@ -20,7 +20,9 @@ from .util import caps
 @pytest.mark.parametrize(
     ("afi", "expected"), [(1, False), (4, True), (6, True)]
 )
-def test_afi(afi: int, expected: bool) -> None:
+def test_afi(
+    loop: asyncio.AbstractEventLoop, afi: int, expected: bool
+) -> None:
     async def inner_fail() -> None:
         with pytest.raises(ValueError):
             PingSocket(afi=afi)
@@ -28,17 +30,17 @@ def test_afi(afi: int, expected: bool) -> None:
     async def inner_ok() -> None:
         PingSocket(afi=afi)
 
-    asyncio.run(inner_ok() if expected else inner_fail())
+    loop.run_until_complete(inner_ok() if expected else inner_fail())
 
 
 @pytest.mark.skipif(caps.is_denied, reason="Permission denied")
-def test_empty_read() -> None:
+def test_empty_read(loop: asyncio.AbstractEventLoop) -> None:
     async def inner() -> None:
         s = PingSocket(afi=4)
         r = s._on_read()
         assert r is None
 
-    asyncio.run(inner())
+    loop.run_until_complete(inner())
 
 
 @pytest.mark.skipif(caps.is_denied, reason="Permission denied")
@@ -54,7 +56,9 @@ def test_empty_read() -> None:
         (6, "0::1", "::1"),
     ],
 )
-def test_clean_ip(afi: int, addr: str, expected: str) -> None:
+def test_clean_ip(
+    loop: asyncio.AbstractEventLoop, afi: int, addr: str, expected: str
+) -> None:
     async def inner_ok() -> None:
         s = PingSocket(afi=afi)
         assert s.clean_ip(addr) == expected
@@ -64,4 +68,70 @@ def test_clean_ip(afi: int, addr: str, expected: str) -> None:
         with pytest.raises(ValueError):
             s.clean_ip(addr)
 
-    asyncio.run(inner_ok() if expected else inner_fail())
+    loop.run_until_complete(inner_ok() if expected else inner_fail())
+
+
+@pytest.mark.skipif(caps.is_denied, reason="Permission denied")
+def test_submit_many(loop: asyncio.AbstractEventLoop) -> None:
+    async def inner() -> None:
+        s = PingSocket(afi=4)
+        futures = s.submit_many("127.0.0.1", 4, request_id=1, seq=0xFFFE)
+        assert len(futures) == 4
+        for rtt in await asyncio.gather(*futures):
+            assert rtt is not None
+        s.close()
+
+    loop.run_until_complete(inner())
+
+
+@pytest.mark.skipif(caps.is_denied, reason="Permission denied")
+def test_close(loop: asyncio.AbstractEventLoop) -> None:
+    async def inner() -> None:
+        s = PingSocket(afi=4)
+        # TEST-NET-1, never replies
+        fut = s.submit("192.0.2.1")
+        s.close()
+        assert fut.done()
+        assert fut.result() is None
+        # Idempotent
+        s.close()
+
+    loop.run_until_complete(inner())
+
+
+@pytest.mark.skipif(caps.is_denied, reason="Permission denied")
+@pytest.mark.parametrize(
+    ("addr", "expected"),
+    [
+        ("127.0.0.1", True),  # Resolved by reply
+        ("192.0.2.1", False),  # TEST-NET-1, resolved by timeout
+    ],
+)
+def test_cancelled(
+    loop: asyncio.AbstractEventLoop, addr: str, expected: bool
+) -> None:
+    async def inner() -> None:
+        s = PingSocket(afi=4, timeout=0.1)
+        futures = s.submit_many(addr, 2, request_id=2)
+        futures[0].cancel()
+        rtt = await asyncio.wait_for(futures[1], 1.0)
+        assert (rtt is not None) is expected
+        s.close()
+
+    loop.run_until_complete(inner())
+
+
+@pytest.mark.skipif(caps.is_denied, reason="Permission denied")
+def test_idle_reader(loop: asyncio.AbstractEventLoop) -> None:
+    async def inner() -> None:
+        s = PingSocket(afi=4, timeout=0.1)
+        assert await s.submit("127.0.0.1") is not None
+        # First check: no sessions, but request was sent
+        await asyncio.sleep(0.15)
+        assert s._PingSocket__reading
+        # Second check: idle for the whole timeout
+        await asyncio.sleep(0.1)
+        assert not s._PingSocket__reading
+        s.close()
+
+    loop.run_until_complete(inner())
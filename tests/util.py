@@ -11,6 +11,27 @@ from typing import Any, Dict, List
 
 
 class Caps(object):
+    @staticmethod
+    def _probe(family: int, proto: int, addr: str) -> bool:
+        """
+        Check raw socket may be opened and bound.
+
+        Args:
+            family: Address family.
+            proto: Socket protocol.
+            addr: Address to bind.
+
+        Returns:
+            * True - if raw socket is allowed.
+            * False - otherwise.
+        """
+        try:
+            with socket.socket(family, socket.SOCK_RAW, proto) as s:
+                s.bind((addr, 0))
+            return True
+        except OSError:
+            return False
+
     @cached_property
     def has_ipv4(self: "Caps") -> bool:
         """
@@ -20,14 +41,7 @@ class Caps(object):
             * True - if IPv4 raw sockets are allowed.
             * False - if IPv4 raw sockets are denied.
         """
-        try:
-            s = socket.socket(
-                socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP
-            )
-            s.bind(("127.0.0.1", 0))
-            return True
-        except OSError:
-            return False
+        return self._probe(socket.AF_INET, socket.IPPROTO_ICMP, "127.0.0.1")
 
     @cached_property
     def has_ipv6(self: "Caps") -> bool:
@@ -38,14 +52,7 @@ class Caps(object):
             * True - if IPv6 raw sockets are allowed.
             * False - if IPv6 raw sockets are denied.
         """
-        try:
-            s = socket.socket(
-                socket.AF_INET6, socket.SOCK_RAW, socket.IPPROTO_ICMPV6
-            )
-            s.bind(("::1", 0))
-            return True
-        except OSError:
-            return False
+        return self._probe(socket.AF_INET6, socket.IPPROTO_ICMPV6, "::1")
 
     @cached_property
     def is_denied(self: "Caps") -> bool: